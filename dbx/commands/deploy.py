@@ -7,7 +7,6 @@ from typing import Dict, Any, Union, Optional
 from typing import List
 
 import click
-import mlflow
 from databricks_cli.cluster_policies.api import PolicyService
 from databricks_cli.configure.config import debug_option
 from databricks_cli.jobs.api import JobsService, JobsApi
@@ -120,6 +119,8 @@ def deploy(
     write_specs_to_file: Optional[str],
     branch_name: Optional[str],
 ):
+    import mlflow
+
     dbx_echo(f"Starting new deployment for environment {environment}")
 
     api_client = prepare_environment(environment)
@@ -250,6 +251,8 @@ def _preprocess_requirements(requirements):
 
 
 def _log_dbx_file(content: Dict[Any, Any], name: str):
+    import mlflow
+
     temp_dir = tempfile.mkdtemp()
     serialized_data = json.dumps(content, indent=4)
     temp_path = pathlib.Path(temp_dir, name)
@@ -504,13 +507,6 @@ def _walk_content(func, content, parent=None, index=None):
         parent[index] = func(content)
 
 
-def _upload_file(local_path: pathlib.Path, adjusted_path: str, file_uploader: FileUploader):
-    if file_uploader.file_exists(adjusted_path):
-        dbx_echo("File is already stored in the deployment, no action needed")
-    else:
-        file_uploader.upload_file(local_path)
-
-
 def _strict_path_adjustment(candidate: str, adjustment: str, file_uploader: FileUploader) -> str:
     if candidate.startswith("file:"):
         fuse_flag = candidate.startswith("file:fuse:")
@@ -529,7 +525,7 @@ def _strict_path_adjustment(candidate: str, adjustment: str, file_uploader: File
             local_path.as_posix(),
         )
 
-        _upload_file(local_path, adjusted_path, file_uploader)
+        file_uploader.upload_file_if_missing(local_path, adjusted_path)
 
         return adjusted_path
 
@@ -549,10 +545,7 @@ def _non_strict_path_adjustment(candidate: str, adjustment: str, file_uploader:
 
     if local_file_exists:
         adjusted_path = "%s/%s" % (adjustment, file_path.as_posix())
-        if file_uploader.file_exists(adjusted_path):
-            dbx_echo("File is already stored in the deployment, no action needed")
-        else:
-            file_uploader.upload_file(file_path)
+        file_uploader.upload_file_if_missing(file_path, adjusted_path)
         return adjusted_path
     else:
         return candidate
@@ -3,7 +3,6 @@ import time
 from typing import Any, List
 
 import click
-import mlflow
 from databricks_cli.clusters.api import ClusterService
 from databricks_cli.configure.config import debug_option
 from databricks_cli.utils import CONTEXT_SETTINGS
@@ -80,6 +79,8 @@ def execute(
     no_package: bool,
     no_rebuild: bool,
 ):
+    import mlflow
+
     api_client = prepare_environment(environment)
 
     cluster_id = _preprocess_cluster_args(api_client, cluster_name, cluster_id)
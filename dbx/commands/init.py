@@ -5,7 +5,7 @@ from cookiecutter.main import cookiecutter
 from databricks_cli.configure.config import debug_option
 from databricks_cli.utils import CONTEXT_SETTINGS
 
-from dbx.utils.common import dbx_echo, TEMPLATE_CHOICES, TEMPLATE_ROOT_PATH
+from dbx.utils.common import dbx_echo, parse_multiple, TEMPLATE_CHOICES, TEMPLATE_ROOT_PATH
 
 
 @click.command(
@@ -50,8 +50,7 @@ def init(template: str, parameters: Optional[List[str]], no_input: bool = False)
         )
         parameters = {}
     else:
-        splits = [item.split("=") for item in parameters]
-        parameters = {item[0]: item[1] for item in splits}
+        parameters = parse_multiple(parameters)
 
     renderable_template_path = TEMPLATE_ROOT_PATH / template / "render"
     cookiecutter(str(renderable_template_path), extra_context=parameters, no_input=no_input)
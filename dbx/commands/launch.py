@@ -5,8 +5,6 @@ from typing import Dict, Any, Optional, Tuple
 from typing import List
 
 import click
-import mlflow
-import pandas as pd
 from databricks_cli.configure.config import debug_option
 from databricks_cli.dbfs.api import DbfsService
 from databricks_cli.jobs.api import JobsService
@@ -112,6 +110,8 @@ def launch(
     parameters_raw: Optional[str],
     branch_name: Optional[str],
 ):
+    import mlflow
+
     dbx_echo(f"Launching job {job} on environment {environment}")
 
     api_client = prepare_environment(environment)
@@ -191,6 +191,9 @@ def launch(
 def _find_deployment_run(
     filter_string: str, tags: Dict[str, str], as_run_submit: bool, environment: str
 ) -> Dict[str, Any]:
+    import mlflow
+    import pandas as pd
+
     runs = mlflow.search_runs(filter_string=filter_string, order_by=["start_time DESC"])
 
     filter_conditions = []
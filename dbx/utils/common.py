@@ -1,16 +1,15 @@
 import copy
 import datetime as dt
+import functools
 import json
 import os
 import pathlib
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable, Type, Match, TYPE_CHECKING
 from abc import ABC, abstractmethod
 import re
+import stat
+import tempfile
 import click
-import git
-import mlflow
-import mlflow.entities
-import pkg_resources
 import requests
 from databricks_cli.configure.config import _get_api_client  # noqa
 from databricks_cli.configure.provider import (
@@ -23,12 +22,18 @@ from databricks_cli.dbfs.api import DbfsService
 from databricks_cli.sdk import ClusterService
 from databricks_cli.sdk.api_client import ApiClient
 from databricks_cli.workspace.api import WorkspaceService
-from path import Path
 from retry import retry
-import ruamel.yaml
-from setuptools import sandbox
 import emoji
 
+# heavy dependencies are imported where they're used to keep the CLI startup fast
+if TYPE_CHECKING:
+    import ruamel.yaml  # noqa
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DBX_PATH = ".dbx"
 INFO_FILE_PATH = f"{DBX_PATH}/project.json"
 LOCK_FILE_PATH = f"{DBX_PATH}/lock.json"
@@ -36,13 +41,20 @@ DATABRICKS_MLFLOW_URI = "databricks"
 DEFAULT_DEPLOYMENT_FILE_PATH = "conf/deployment.json"
 
 PROJECTS_RELATIVE_PATH = "templates/projects"
-TEMPLATE_CHOICES = pkg_resources.resource_listdir("dbx", PROJECTS_RELATIVE_PATH)
-TEMPLATE_ROOT_PATH = pathlib.Path(pkg_resources.resource_filename("dbx", PROJECTS_RELATIVE_PATH))
+# templates are shipped as package data, resolving them relative to the package avoids the slow pkg_resources import
+TEMPLATE_ROOT_PATH = pathlib.Path(__file__).resolve().parent.parent / PROJECTS_RELATIVE_PATH
+TEMPLATE_CHOICES = [p.name for p in TEMPLATE_ROOT_PATH.iterdir() if p.is_dir()]
 
 
 def dbx_echo(message: str):
-    formatted_time = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    formatted_message = f"[dbx][{formatted_time}] {message}"
+    now = dt.datetime.now()
+    formatted_message = f"[dbx][{now:%Y-%m-%d %H:%M:%S}.{now.microsecond // 1000:03d}] {message}"
+
+    # emoji shortcodes look like :name:, so messages without a colon are printed as is
+    if ":" not in message:
+        click.echo(formatted_message)
+        return
+
     try:
         click.echo(emoji.emojize(formatted_message))
     # this is a fix for unicode error on some platforms as per https://github.com/databrickslabs/dbx/issues/121
@@ -51,28 +63,97 @@ def dbx_echo(message: str):
 
 
 def parse_multiple(multiple_argument: List[str]) -> Dict[str, str]:
-    tags_splitted = [t.split("=") for t in multiple_argument]
-    tags_dict = {t[0]: t[1] for t in tags_splitted}
+    tags_dict = {}
+    for t in multiple_argument:
+        # values may contain "=" as well, hence only the first occurrence is used as a separator
+        key, separator, value = t.partition("=")
+        if not separator:
+            raise Exception(f"Argument {t} is not provided in the format of key=value")
+        tags_dict[key] = value
     return tags_dict
 
 
+# orjson is used for faster parsing if installed, otherwise falling back to the stdlib json
+def _loads_json(data: bytes) -> Dict[str, Any]:
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# serialization always goes through the stdlib json, since orjson doesn't support the 4-space indentation
+def _dumps_json(content: Dict[str, Any]) -> bytes:
+    return json.dumps(content, indent=4, ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomically(data: bytes, file_path: str):
+    # readers never see a partially written file, since os.replace swaps the files in a single step.
+    # the temporary file name is unique, so concurrent writers don't interfere with each other
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".")
+    try:
+        # the descriptor is wrapped right away, so it's closed even if anything below fails
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates the file as 0600, keep the permissions a regular open() would give
+            try:
+                mode = stat.S_IMODE(os.stat(file_path).st_mode)
+            except FileNotFoundError:
+                # umask can only be read by setting it, this is safe since dbx runs single-threaded
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            # os.fchmod is not available on Windows
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), mode)
+            else:
+                os.chmod(tmp_path, mode)
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    _json_cache.pop(os.path.abspath(file_path), None)
+
+
 def read_json(file_path: str) -> Dict[str, Any]:
-    with open(file_path, "r") as f:
-        return json.load(f)
+    with open(file_path, "rb") as f:
+        return _loads_json(f.read())
 
 
 def write_json(content: Dict[str, Any], file_path: str):
-    with open(file_path, "w") as f:
-        json.dump(content, f, indent=4)
+    _write_atomically(_dumps_json(content), file_path)
+
+
+# contents of the small project-level JSON files, keyed by absolute path with (mtime_ns, size) stamps
+_json_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+
+def _read_json_cached(file_path: str) -> Dict[str, Any]:
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, read_json(path))
+        _json_cache[path] = cached
+
+    # callers are free to modify the returned content
+    return copy.deepcopy(cached[1])
 
 
 def update_json(new_content: Dict[str, Any], file_path: str):
     try:
-        content = read_json(file_path)
+        with open(file_path, "rb") as f:
+            current_data = f.read()
+        content = _loads_json(current_data)
     except FileNotFoundError:
-        content = {}
+        current_data, content = None, {}
+
     content.update(new_content)
-    write_json(content, file_path)
+    new_data = _dumps_json(content)
+
+    # unchanged content is not re-written to keep the file modification time (and the caches relying on it) stable
+    if new_data != current_data:
+        _write_atomically(new_data, file_path)
 
 
 class ContextLockFile:
@@ -82,15 +163,67 @@ class ContextLockFile:
 
     @staticmethod
     def get_context() -> Any:
-        if pathlib.Path(LOCK_FILE_PATH).exists():
-            return read_json(LOCK_FILE_PATH).get("context_id")
-        else:
+        try:
+            return _read_json_cached(LOCK_FILE_PATH).get("context_id")
+        except FileNotFoundError:
             return None
 
 
+# ENV variable pattern, e.g. ${VAR_NAME} or ${VAR_NAME:default_value}
+_ENV_RE = re.compile(r"\$\{([^}{:]+)(?::([^}{]+))?\}")
+
+
+def _env_resolve(match: Match) -> str:
+    env_var_name, default_val = match.group(1, 2)
+    env_val = os.environ.get(env_var_name, "")
+
+    if env_val == "" and default_val:
+        env_val = default_val
+
+    return env_val
+
+
+def _resolve_env_string(value: str) -> str:
+    # plain substring search is much cheaper than the regex for the common case without variables
+    if "${" not in value:
+        return value
+
+    return _ENV_RE.sub(_env_resolve, value)
+
+
+def _walk(content: Any, func: Callable[[str], Any]) -> Any:
+    """
+    Returns a copy of the given dict/list structure with func applied to every string (both keys and values)
+    """
+    if isinstance(content, dict):
+        return {_walk(key, func): _walk(value, func) for key, value in content.items()}
+    elif isinstance(content, list):
+        return [_walk(item, func) for item in content]
+    elif isinstance(content, str):
+        return func(content)
+    else:
+        return content
+
+
+def _ext(path: str) -> str:
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
 class AbstractDeploymentConfig(ABC):
     def __init__(self, path):
         self._path = path
+        self._content: Optional[Dict[str, Any]] = None
+
+    @property
+    def _data(self) -> Dict[str, Any]:
+        # the file is read and resolved once per config instance
+        if self._content is None:
+            self._content = self._read_content()
+        return self._content
+
+    @abstractmethod
+    def _read_content(self) -> Dict[str, Any]:
+        pass
 
     @abstractmethod
     def get_environment(self, environment: str) -> Any:
@@ -101,7 +234,16 @@ class AbstractDeploymentConfig(ABC):
         pass
 
     def _get_file_extension(self):
-        return self._path.split(".").pop()
+        return _ext(self._path)
+
+
+# parsed YAML deployment files, keyed by absolute file path, modification time and size
+_YAML_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+class _EnvVarScalar(str):
+    # scalar marked with the !ENV tag, resolved against the environment on every read
+    pass
 
 
 class YamlDeploymentConfig(AbstractDeploymentConfig):
@@ -109,93 +251,124 @@ class YamlDeploymentConfig(AbstractDeploymentConfig):
     # if you need to round-trip see this: https://yaml.readthedocs.io/en/latest/overview.html
 
     # ENV variable pattern and tag
-    PATTERN = re.compile(r".*?\$\{([^}{:]+)(:[^}^{]+)?\}.*?")
+    PATTERN = _ENV_RE
     YAML_TAG = "!ENV"
+    # implicit resolvers are matched from the beginning of the scalar, hence the leading wildcard
+    IMPLICIT_PATTERN = re.compile(r".*?" + _ENV_RE.pattern)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        _YAML_CACHE.clear()
+
+    # loader with the !ENV tag registered, created once on first read
+    _LOADER: Optional[Type["ruamel.yaml.SafeLoader"]] = None
+
+    @classmethod
+    def _get_loader(cls) -> Type["ruamel.yaml.SafeLoader"]:
+        import ruamel.yaml
+
+        if cls._LOADER is None:
+            # a dedicated subclass keeps the global SafeLoader untouched
+            loader = type("EnvVarSafeLoader", (ruamel.yaml.SafeLoader,), {})
 
-    def resolve_env_vars(self, loader: ruamel.yaml.SafeLoader, node: ruamel.yaml.Node):
-        value = loader.construct_scalar(node)
-        match = self.PATTERN.findall(value)
+            # Tags indicate where to search for the pattern
+            # In this case, it is !ENV
+            loader.add_implicit_resolver(cls.YAML_TAG, cls.IMPLICIT_PATTERN, None)
 
-        full_value = value
-        if match:
-            for var in match:
-                env_var_name, default_val = var
-                env_val = os.environ.get(env_var_name, "")
+            # Env variables are only marked during parsing and resolved after reading from the cache
+            loader.add_constructor(cls.YAML_TAG, cls._construct_env_var)
+            cls._LOADER = loader
+        return cls._LOADER
 
-                if env_val == "" and default_val:
-                    env_val = default_val[1:]  # Remove the leading colon
+    @staticmethod
+    def _construct_env_var(loader: "ruamel.yaml.SafeLoader", node: "ruamel.yaml.Node") -> _EnvVarScalar:
+        return _EnvVarScalar(loader.construct_scalar(node))
+
+    def _resolve_scalar(self, value: str) -> str:
+        if not isinstance(value, _EnvVarScalar):
+            return value
 
-                val_to_replace = "".join(var)
-                full_value = full_value.replace(f"${{{val_to_replace}}}", env_val)
+        return str(_resolve_env_string(value))
 
-        return full_value
+    def resolve_env_vars(self, content: Any) -> Any:
+        # env variables are resolved on a copy, so the cached content stays untouched
+        return _walk(content, self._resolve_scalar)
 
     def _read_yaml(self, file_path: str) -> Dict[str, Any]:
-        loader = ruamel.yaml.SafeLoader
+        st = os.stat(file_path)
+        # size is part of the key for filesystems with a coarse modification time resolution
+        cache_key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        content = _YAML_CACHE.get(cache_key)
+
+        if content is None:
+            import ruamel.yaml
 
-        # Tags indicate where to search for the pattern
-        # In this case, it is !ENV
-        loader.add_implicit_resolver(self.YAML_TAG, self.PATTERN, None)
+            with open(file_path, "r") as f:
+                content = ruamel.yaml.load(f, Loader=self._get_loader())
+            _YAML_CACHE[cache_key] = content
 
-        # Env variable resolver
-        loader.add_constructor(self.YAML_TAG, self.resolve_env_vars)
+        return self.resolve_env_vars(content)
 
-        with open(file_path, "r") as f:
-            return ruamel.yaml.load(f, Loader=loader)
+    def _read_content(self) -> Dict[str, Any]:
+        return self._read_yaml(self._path)
 
     def get_environment(self, environment: str) -> Any:
-        return self._read_yaml(self._path).get("environments").get(environment)
+        return self._data.get("environments").get(environment)
 
     def get_all_environment_names(self) -> List[str]:
-        return list(self._read_yaml(self._path).get("environments").keys())
+        return list(self._data.get("environments").keys())
 
 
 class JsonDeploymentConfig(AbstractDeploymentConfig):
     # ENV variable pattern
-    PATTERN = re.compile(r"\$\{([^}{:]+)(:[^}^{]+)?\}")
+    PATTERN = _ENV_RE
 
     def resolve_env_vars(self, json_obj: Dict[str, Any]) -> Dict[str, Any]:
-        json_str = json.dumps(json_obj)
-
-        def _env_resolver(match):
-            env_var_name, default_val = match.group(1, 2)
-            env_val = os.environ.get(env_var_name, "")
-
-            if env_val == "" and default_val:
-                env_val = default_val[1:]  # Remove the leading colon
+        # substitution happens on the parsed strings, hence no JSON escaping of the values is required
+        return _walk(json_obj, _resolve_env_string)
 
-            return json.dumps(env_val)[1:-1]
-
-        return json.loads(self.PATTERN.sub(_env_resolver, json_str))
+    def _read_content(self) -> Dict[str, Any]:
+        return self.resolve_env_vars(read_json(self._path))
 
     def get_environment(self, environment: str) -> Any:
-        return self.resolve_env_vars(read_json(self._path)).get(environment)
+        return self._data.get(environment)
 
     def get_all_environment_names(self) -> Any:
-        return list(self.resolve_env_vars(read_json(self._path)).keys())
+        return list(self._data.keys())
+
+
+_DEPLOYMENT_CONFIG_HANDLERS = {
+    "json": JsonDeploymentConfig,
+    "yml": YamlDeploymentConfig,
+    "yaml": YamlDeploymentConfig,
+}
 
 
 def get_deployment_config(path: str) -> AbstractDeploymentConfig:
-    ext = path.split(".").pop()
-    if ext == "json":
-        return JsonDeploymentConfig(path)
-    elif ext in ["yml", "yaml"]:
-        return YamlDeploymentConfig(path)
-    else:
+    ext = _ext(path)
+    try:
+        handler = _DEPLOYMENT_CONFIG_HANDLERS[ext]
+    except KeyError:
         raise Exception(f"Undefined config file handler for extension: {ext}")
+    return handler(path)
 
 
 class InfoFile:
     @staticmethod
     def _create_dir() -> None:
-        if not Path(DBX_PATH).exists():
-            dbx_echo("dbx directory is not present, creating it")
+        try:
             os.mkdir(DBX_PATH)
+            dbx_echo("dbx directory was not present, created it")
+        except FileExistsError:
+            pass
 
     @staticmethod
     def _create_lock_file() -> None:
-        if not Path(LOCK_FILE_PATH).exists():
-            pathlib.Path(LOCK_FILE_PATH).write_text("{}")
+        try:
+            with open(LOCK_FILE_PATH, "x") as f:
+                f.write("{}")
+        except FileExistsError:
+            pass
 
     @staticmethod
     def initialize():
@@ -212,30 +385,37 @@ class InfoFile:
 
     @staticmethod
     def get(item: str) -> Any:
-        if not pathlib.Path(INFO_FILE_PATH).exists():
+        try:
+            content = _read_json_cached(INFO_FILE_PATH)
+        except FileNotFoundError:
             raise Exception("Your project is not yet configured, please configure it via `dbx configure`")
-        return read_json(INFO_FILE_PATH).get(item)
+        return content.get(item)
 
 
 class ApiV1Client:
+    API_VERSION = "1.2"
+
     def __init__(self, api_client: ApiClient):
-        self.v1_client = copy.deepcopy(api_client)
-        self.v1_client.api_version = "1.2"
+        # the API version is passed per request, so that the HTTP session of the original client is reused
+        self.v1_client = api_client
+
+    def _perform_query(self, method: str, path: str, data: Dict[str, Any]) -> Dict[Any, Any]:
+        return self.v1_client.perform_query(method=method, path=path, data=data, version=self.API_VERSION)
 
     def get_command_status(self, payload) -> Dict[Any, Any]:
-        result = self.v1_client.perform_query(method="GET", path="/commands/status", data=payload)
+        result = self._perform_query(method="GET", path="/commands/status", data=payload)
         return result
 
     def cancel_command(self, payload) -> None:
-        self.v1_client.perform_query(method="POST", path="/commands/cancel", data=payload)
+        self._perform_query(method="POST", path="/commands/cancel", data=payload)
 
     def execute_command(self, payload) -> Dict[Any, Any]:
-        result = self.v1_client.perform_query(method="POST", path="/commands/execute", data=payload)
+        result = self._perform_query(method="POST", path="/commands/execute", data=payload)
         return result
 
     def get_context_status(self, payload):
         try:
-            result = self.v1_client.perform_query(method="GET", path="/contexts/status", data=payload)
+            result = self._perform_query(method="GET", path="/contexts/status", data=payload)
             return result
         except requests.exceptions.HTTPError:
             return None
@@ -244,7 +424,7 @@ class ApiV1Client:
     # to make the execute command stable is such situations, we add retry handler.
     @retry(tries=10, delay=5, backoff=5)
     def create_context(self, payload):
-        result = self.v1_client.perform_query(method="POST", path="/contexts/create", data=payload)
+        result = self._perform_query(method="POST", path="/contexts/create", data=payload)
         return result
 
 
@@ -285,10 +465,18 @@ def profile_option(f):
     )(f)
 
 
+# (workspace url, directory) pairs already created in this process
+_MKDIRS_DONE: Set[Tuple[str, str]] = set()
+
+
 def _prepare_workspace_dir(api_client: ApiClient, ws_dir: str):
     p = str(pathlib.PurePosixPath(ws_dir).parent)
+    key = (api_client.url, p)
+    if key in _MKDIRS_DONE:
+        return
     service = WorkspaceService(api_client)
     service.mkdirs(p)
+    _MKDIRS_DONE.add(key)
 
 
 def get_environment_data(environment: str) -> Dict[str, Any]:
@@ -316,6 +504,8 @@ def pick_config(environment_data: Dict[str, Any]) -> Tuple[str, DatabricksConfig
 
 
 def prepare_environment(environment: str) -> ApiClient:
+    import mlflow
+
     environment_data = get_environment_data(environment)
 
     config_type, config = pick_config(environment_data)
@@ -366,10 +556,9 @@ def prepare_environment(environment: str) -> ApiClient:
 
 def get_package_file() -> Optional[pathlib.Path]:
     dbx_echo("Locating package file")
-    file_locator = list(pathlib.Path("dist").glob("*.whl"))
-    sorted_locator = sorted(file_locator, key=os.path.getmtime)  # get latest modified file, aka latest package version
-    if sorted_locator:
-        file_path = sorted_locator[-1]
+    # get latest modified file, aka latest package version
+    file_path = max(pathlib.Path("dist").glob("*.whl"), key=os.path.getmtime, default=None)
+    if file_path:
         dbx_echo(f"Package file located in: {file_path}")
         return file_path
     else:
@@ -382,6 +571,8 @@ def handle_package(rebuild_arg):
         dbx_echo("No rebuild will be done, please ensure that the package distribution is in dist folder")
     else:
         dbx_echo("Re-building package")
+        from setuptools import sandbox
+
         if not pathlib.Path("setup.py").exists():
             raise Exception(
                 "No setup.py provided in project directory. Please create one, or disable rebuild via --no-rebuild"
@@ -398,6 +589,8 @@ class FileUploader:
         """
         self._dbfs_service = DbfsService(api_client)
         self.is_strict = is_strict
+        # remote paths already checked or uploaded by this uploader
+        self._stored_paths: Set[str] = set()
 
     def file_exists(self, file_path: str):
         try:
@@ -408,25 +601,49 @@ class FileUploader:
 
     @retry(tries=3, delay=1, backoff=0.3)
     def upload_file(self, file_path: pathlib.Path):
+        import mlflow
+
         posix_path_str = file_path.as_posix()
         posix_path = pathlib.PurePosixPath(posix_path_str)
         dbx_echo(f"Deploying file: {file_path}")
         mlflow.log_artifact(str(file_path), str(posix_path.parent))
 
+    def upload_file_if_missing(self, file_path: pathlib.Path, remote_path: str):
+        # files referenced multiple times are checked against DBFS only once
+        if remote_path in self._stored_paths or self.file_exists(remote_path):
+            dbx_echo("File is already stored in the deployment, no action needed")
+        else:
+            self.upload_file(file_path)
+        self._stored_paths.add(remote_path)
+
+
+_GIT_BRANCH_REF_PREFIX = "ref: refs/heads/"
 
+
+# the branch is resolved once per process, switching branches during a single dbx command is not picked up
+@functools.lru_cache(maxsize=1)
 def get_current_branch_name() -> Optional[str]:
     if "GITHUB_REF" in os.environ:
         ref = os.environ["GITHUB_REF"].split("/")
         return ref[-1]
     else:
-        try:
-            repo = git.Repo(".", search_parent_directories=True)
-            if repo.head.is_detached:
+        # HEAD is read directly instead of going through git, which requires spawning git processes
+        cwd = pathlib.Path.cwd()
+        for directory in (cwd, *cwd.parents):
+            git_path = directory / ".git"
+
+            # in worktrees and submodules .git is a file pointing to the actual git directory
+            if git_path.is_file():
+                git_path = directory / git_path.read_text().partition("gitdir:")[2].strip()
+
+            head_path = git_path / "HEAD"
+            if head_path.is_file():
+                head = head_path.read_text().strip()
+                if head.startswith(_GIT_BRANCH_REF_PREFIX):
+                    return head[len(_GIT_BRANCH_REF_PREFIX) :]
+                # detached HEAD
                 return None
-            else:
-                return repo.active_branch.name
-        except git.InvalidGitRepositoryError:
-            return None
+        return None
 
 
 def _preprocess_cluster_args(api_client: ApiClient, cluster_name: Optional[str], cluster_id: Optional[str]) -> str:
@@ -437,18 +654,22 @@ def _preprocess_cluster_args(api_client: ApiClient, cluster_name: Optional[str],
 
     if cluster_name:
 
-        existing_clusters = [
-            c for c in cluster_service.list_clusters().get("clusters") if not c.get("cluster_name").startswith("job-")
-        ]
-        matching_clusters = [c for c in existing_clusters if c.get("cluster_name") == cluster_name]
+        # single pass over the listing, job clusters are skipped
+        cluster_ids_by_name: Dict[str, List[str]] = {}
+        for cluster in cluster_service.list_clusters().get("clusters") or []:
+            name = cluster.get("cluster_name", "")
+            if not name.startswith("job-"):
+                cluster_ids_by_name.setdefault(name, []).append(cluster["cluster_id"])
+
+        matching_cluster_ids = cluster_ids_by_name.get(cluster_name, [])
 
-        if not matching_clusters:
-            cluster_names = [c["cluster_name"] for c in existing_clusters]
+        if not matching_cluster_ids:
+            cluster_names = list(cluster_ids_by_name)
             raise NameError(f"No clusters with name {cluster_name} found. Available clusters are: {cluster_names} ")
-        if len(matching_clusters) > 1:
-            raise NameError(f"Found more then one cluster with name {cluster_name}: {matching_clusters}")
+        if len(matching_cluster_ids) > 1:
+            raise NameError(f"Found more then one cluster with name {cluster_name}: {matching_cluster_ids}")
 
-        cluster_id = matching_clusters[0]["cluster_id"]
+        cluster_id = matching_cluster_ids[0]
     else:
         if not cluster_service.get_cluster(cluster_id):
             raise NameError(f"Cluster with id {cluster_id} not found")
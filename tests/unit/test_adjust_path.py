@@ -76,6 +76,22 @@ class AdjustPathTest(unittest.TestCase):
             "dbfs:/fake/test/tests/deployment-configs/placeholder_1.py",
         )
 
+    def test_that_files_referenced_multiple_times_are_checked_once(self):
+        file_path = format_path("../deployment-configs/aws-example.json")
+        deployment = json.loads(Path(file_path).read_text())["default"]
+        python_file = py_.get(deployment, "jobs.[0].spark_python_task.python_file")
+        py_.set_(deployment, "jobs.[0].spark_python_task.parameters", [python_file])
+        api_client = MagicMock()
+        _file_uploader = FileUploader(api_client)
+
+        _adjust_job_definitions(deployment["jobs"], "dbfs:/fake/test", [], [], _file_uploader, api_client)
+
+        api_client.perform_query.assert_called_once()
+        self.assertEqual(
+            py_.get(deployment, "jobs.[0].spark_python_task.parameters.[0]"),
+            "dbfs:/fake/test/tests/deployment-configs/placeholder_1.py",
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,29 @@
+import tempfile
+import time
 import unittest
 from unittest import mock
-from dbx.utils.common import update_json, ContextLockFile, get_deployment_config
+
+import emoji
+import ruamel.yaml
+
+from dbx.utils.common import (
+    _prepare_workspace_dir,  # noqa
+    parse_multiple,
+    dbx_echo,
+    get_current_branch_name,
+    ApiV1Client,
+    get_package_file,
+    InfoFile,
+    INFO_FILE_PATH,
+    read_json,
+    write_json,
+    update_json,
+    ContextLockFile,
+    get_deployment_config,
+    YamlDeploymentConfig,
+    JsonDeploymentConfig,
+    _EnvVarScalar,  # noqa
+)
 from .utils import DbxTest
 import os
 
@@ -135,6 +158,210 @@ class CommonUnitTest(unittest.TestCase):
 
         self.assertEqual(int(max_retries), 3)
 
+    @mock.patch.dict(os.environ, {"TIMEOUT": "100"}, clear=True)
+    def test_yaml_file_is_parsed_once_and_env_variables_are_resolved_on_each_read(self):
+        YamlDeploymentConfig.clear_cache()
+        yaml_file = format_path("../deployment-configs/04-yaml-with-env-vars.yaml")
+
+        with mock.patch("ruamel.yaml.load", wraps=ruamel.yaml.load) as load_mock:
+            first_env = YamlDeploymentConfig(yaml_file).get_environment("default")
+            os.environ["TIMEOUT"] = "200"
+            second_env = YamlDeploymentConfig(yaml_file).get_environment("default")
+
+        self.assertEqual(load_mock.call_count, 1)
+        self.assertEqual(first_env.get("jobs")[0].get("timeout_seconds"), "100")
+        self.assertEqual(second_env.get("jobs")[0].get("timeout_seconds"), "200")
+
+    def test_yaml_file_is_reparsed_after_modification(self):
+        YamlDeploymentConfig.clear_cache()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            yaml_file = os.path.join(tmp_dir, "deployment.yaml")
+
+            with open(yaml_file, "w") as f:
+                f.write("environments:\n  default:\n    jobs: []\n")
+            self.assertEqual(YamlDeploymentConfig(yaml_file).get_all_environment_names(), ["default"])
+
+            with open(yaml_file, "w") as f:
+                f.write("environments:\n  staging:\n    jobs: []\n")
+            stat = os.stat(yaml_file)
+            os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(YamlDeploymentConfig(yaml_file).get_all_environment_names(), ["staging"])
+
+            # same modification time as on filesystems with a coarse resolution, but a different size
+            stat = os.stat(yaml_file)
+            with open(yaml_file, "w") as f:
+                f.write("environments:\n  production:\n    jobs: []\n")
+            os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(YamlDeploymentConfig(yaml_file).get_all_environment_names(), ["production"])
+
+    def test_yaml_env_variables_resolution_on_long_unterminated_scalars(self):
+        # "${" gets past the substring pre-check, so the pattern itself has to scan the whole value
+        long_value = _EnvVarScalar("${" + "a" * 100_000)
+        yaml_config = YamlDeploymentConfig(format_path("../deployment-configs/04-yaml-with-env-vars.yaml"))
+
+        start = time.perf_counter()
+        resolved = yaml_config.resolve_env_vars({"key": long_value})
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(resolved, {"key": long_value})
+        # the old quadratic pattern needed ~50s on this input, the bound is loose enough for slow CI machines
+        self.assertLess(elapsed, 10)
+
+    @mock.patch.dict(os.environ, {"FIRST": "1"}, clear=True)
+    def test_yaml_multiple_env_variables_in_one_scalar(self):
+        yaml_config = YamlDeploymentConfig(format_path("../deployment-configs/04-yaml-with-env-vars.yaml"))
+        resolved = yaml_config.resolve_env_vars({"key": _EnvVarScalar("${FIRST}-${SECOND:two}-${FIRST}")})
+        self.assertEqual(resolved, {"key": "1-two-1"})
+
+    def test_deployment_config_is_picked_by_file_extension(self):
+        self.assertIsInstance(get_deployment_config("conf/deployment.v1.YAML"), YamlDeploymentConfig)
+        self.assertIsInstance(get_deployment_config("conf.d/deployment.yml"), YamlDeploymentConfig)
+        self.assertIsInstance(get_deployment_config("conf/deployment.json"), JsonDeploymentConfig)
+        self.assertRaises(Exception, get_deployment_config, "conf.d/deployment")
+
+    def test_json_round_trip_with_and_without_orjson(self):
+        content = {"environments": {"default": {"profile": "DEFAULT", "workspace_dir": "/Shared/dbx/ü"}}}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, "project.json")
+            fallback_json_file = os.path.join(tmp_dir, "fallback-project.json")
+
+            write_json(content, json_file)
+            self.assertEqual(read_json(json_file), content)
+
+            with mock.patch("dbx.utils.common.orjson", None):
+                self.assertEqual(read_json(json_file), content)
+                write_json(content, fallback_json_file)
+                self.assertEqual(read_json(fallback_json_file), content)
+
+            # both backends have to produce the same bytes, since update_json compares them
+            with open(json_file, "rb") as f, open(fallback_json_file, "rb") as fallback_f:
+                self.assertEqual(f.read(), fallback_f.read())
+
+    def test_api_v1_client_shares_the_original_client(self):
+        api_client = mock.MagicMock(api_version="2.0")
+        v1_client = ApiV1Client(api_client)
+        v1_client.execute_command({"command": "print(1)"})
+
+        self.assertIs(v1_client.v1_client, api_client)
+        self.assertEqual(api_client.api_version, "2.0")
+        api_client.perform_query.assert_called_once_with(
+            method="POST", path="/commands/execute", data={"command": "print(1)"}, version="1.2"
+        )
+
+    @mock.patch.dict(os.environ, {"GITHUB_REF": "refs/heads/first"})
+    def test_current_branch_name_is_cached(self):
+        get_current_branch_name.cache_clear()
+        self.addCleanup(get_current_branch_name.cache_clear)
+
+        self.assertEqual(get_current_branch_name(), "first")
+        os.environ["GITHUB_REF"] = "refs/heads/second"
+        self.assertEqual(get_current_branch_name(), "first")
+
+    def test_deployment_config_is_read_once_per_instance(self):
+        json_file = format_path("../deployment-configs/01-yaml-test.json")
+        yaml_file = format_path("../deployment-configs/01-yaml-test.yaml")
+
+        with mock.patch("dbx.utils.common.read_json", wraps=read_json) as read_mock:
+            json_config = get_deployment_config(json_file)
+            json_config.get_environment("default")
+            json_config.get_all_environment_names()
+            self.assertEqual(read_mock.call_count, 1)
+
+        yaml_config = get_deployment_config(yaml_file)
+        with mock.patch.object(yaml_config, "_read_yaml", wraps=yaml_config._read_yaml) as read_mock:
+            yaml_config.get_environment("default")
+            yaml_config.get_all_environment_names()
+            self.assertEqual(read_mock.call_count, 1)
+
+    def test_dbx_echo(self):
+        with mock.patch("click.echo") as echo_mock, mock.patch("emoji.emojize", wraps=emoji.emojize) as emojize_mock:
+            dbx_echo("plain message")
+            self.assertRegex(
+                echo_mock.call_args[0][0], r"^\[dbx\]\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3}\] plain message$"
+            )
+            emojize_mock.assert_not_called()
+
+            dbx_echo("message with emoji :fire:")
+            self.assertTrue(echo_mock.call_args[0][0].endswith("message with emoji \U0001F525"))
+            emojize_mock.assert_called_once()
+
+    def test_parse_multiple(self):
+        self.assertEqual(parse_multiple([]), {})
+        self.assertEqual(
+            parse_multiple(["cake=cheesecake", "query=a=b", "empty="]),
+            {"cake": "cheesecake", "query": "a=b", "empty": ""},
+        )
+        self.assertRaises(Exception, parse_multiple, ["cheesecake"])
+
+    def test_update_json_skips_unchanged_content(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, "lock.json")
+            update_json({"context_id": "some-context"}, json_file)
+            os.utime(json_file, ns=(0, 0))
+
+            update_json({"context_id": "some-context"}, json_file)
+            self.assertEqual(os.stat(json_file).st_mtime_ns, 0)
+
+            update_json({"context_id": "another-context"}, json_file)
+            self.assertNotEqual(os.stat(json_file).st_mtime_ns, 0)
+            self.assertEqual(read_json(json_file), {"context_id": "another-context"})
+            self.assertEqual(os.listdir(tmp_dir), ["lock.json"])
+
+    def test_failed_json_write_keeps_the_original_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, "lock.json")
+            write_json({"context_id": "some-context"}, json_file)
+
+            with mock.patch("os.replace", side_effect=OSError("replace failed")):
+                self.assertRaises(OSError, write_json, {"context_id": "another-context"}, json_file)
+
+            self.assertEqual(read_json(json_file), {"context_id": "some-context"})
+            self.assertEqual(os.listdir(tmp_dir), ["lock.json"])
+
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_current_branch_name_from_git_head(self):
+        self.addCleanup(get_current_branch_name.cache_clear)
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            nested_dir = os.path.join(tmp_dir, "project", "nested")
+            os.makedirs(nested_dir)
+            os.makedirs(os.path.join(tmp_dir, "repo.git"))
+            os.chdir(nested_dir)
+
+            for git_head, expected_branch in [
+                ("ref: refs/heads/feature/some-branch\n", "feature/some-branch"),
+                ("5f4ab6b3a0ce3df3cd8e0fb0a2e1c5b3b7e6ab21\n", None),
+            ]:
+                with open(os.path.join(tmp_dir, "repo.git", "HEAD"), "w") as f:
+                    f.write(git_head)
+                with open(os.path.join(tmp_dir, "project", ".git"), "w") as f:
+                    f.write(f"gitdir: {os.path.join(tmp_dir, 'repo.git')}\n")
+
+                get_current_branch_name.cache_clear()
+                self.assertEqual(get_current_branch_name(), expected_branch)
+
+    @mock.patch.dict(os.environ, {"SPECIAL": 'say "hi"\\n\tC:\\path'}, clear=True)
+    def test_json_env_variables_with_special_characters_are_substituted_verbatim(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_file = os.path.join(tmp_dir, "deployment.json")
+            write_json({"default": {"value": "prefix-${SPECIAL}", "other": "${MISSING:x}"}}, json_file)
+            environment = get_deployment_config(json_file).get_environment("default")
+
+        self.assertEqual(environment, {"value": 'prefix-say "hi"\\n\tC:\\path', "other": "x"})
+
+    def test_workspace_dir_is_created_once_per_workspace(self):
+        first_client = mock.MagicMock(url="https://first.cloud.databricks.com/api/")
+        second_client = mock.MagicMock(url="https://second.cloud.databricks.com/api/")
+
+        _prepare_workspace_dir(first_client, "/Shared/dbx/projects/mkdirs-test")
+        _prepare_workspace_dir(first_client, "/Shared/dbx/projects/mkdirs-test")
+        _prepare_workspace_dir(second_client, "/Shared/dbx/projects/mkdirs-test")
+
+        first_client.perform_query.assert_called_once()
+        second_client.perform_query.assert_called_once()
+
 
 class CommonTest(DbxTest):
     def test_update_json(self):
@@ -143,6 +370,40 @@ class CommonTest(DbxTest):
     def test_context_lock_file(self):
         self.assertIsNone(ContextLockFile.get_context())
 
+    def test_info_file_initialization_keeps_existing_lock_file(self):
+        with self.project_dir:
+            InfoFile.initialize()
+            ContextLockFile.set_context("some-context")
+            InfoFile.initialize()
+            self.assertEqual(ContextLockFile.get_context(), "some-context")
+
+            os.remove(INFO_FILE_PATH)
+            self.assertRaises(Exception, InfoFile.get, "environments")
+
+    def test_info_file_is_read_once_until_updated(self):
+        with self.project_dir:
+            with mock.patch("dbx.utils.common.read_json", wraps=read_json) as read_mock:
+                environments = InfoFile.get("environments")
+                environments["test"] = {"profile": "test"}
+                self.assertNotIn("test", InfoFile.get("environments"))
+                self.assertEqual(read_mock.call_count, 1)
+
+                InfoFile.update({"environments": environments})
+                self.assertIn("test", InfoFile.get("environments"))
+                self.assertEqual(read_json(INFO_FILE_PATH)["environments"], environments)
+
+    def test_get_package_file_picks_latest_wheel(self):
+        with self.project_dir:
+            self.assertIsNone(get_package_file())
+
+            os.makedirs("dist", exist_ok=True)
+            for idx, name in enumerate(["pkg-0.2.0-py3-none-any.whl", "pkg-0.1.0-py3-none-any.whl"]):
+                wheel = os.path.join("dist", name)
+                open(wheel, "w").close()
+                os.utime(wheel, ns=(idx * 1_000_000_000, idx * 1_000_000_000))
+
+            self.assertEqual(get_package_file().name, "pkg-0.1.0-py3-none-any.whl")
+
     def update_project_file(self):
         pass
 
@@ -103,6 +103,21 @@ class NamedPropertiesProcessorTest(unittest.TestCase):
             self.assertEqual(job_in_yaml["existing_cluster_id"], test_existing_cluster_id)
             self.assertEqual(job_in_json["existing_cluster_id"], test_existing_cluster_id)
 
+    def test_existing_cluster_name_duplicated_or_job_cluster(self):
+        job_in_json = self._get_job_by_name(self.json_deployment_conf, "named-props-existing-cluster-name")
+        api_client = MagicMock()
+        clusters = [
+            {"cluster_name": "some-cluster", "cluster_id": "aaa-bbb-000-ccc"},
+            {"cluster_name": "some-cluster", "cluster_id": "aaa-bbb-000-ddd"},
+            {"cluster_name": "job-some-cluster", "cluster_id": "aaa-bbb-000-eee"},
+        ]
+        with patch.object(ClusterService, "list_clusters", return_value={"clusters": clusters}):
+            self.assertRaises(NameError, NamedPropertiesProcessor(job_in_json, api_client).preprocess)
+        with patch.object(ClusterService, "list_clusters", return_value={"clusters": clusters[2:]}):
+            self.assertRaises(NameError, NamedPropertiesProcessor(job_in_json, api_client).preprocess)
+        with patch.object(ClusterService, "list_clusters", return_value={}):
+            self.assertRaises(NameError, NamedPropertiesProcessor(job_in_json, api_client).preprocess)
+
     def test_existing_cluster_name_negative(self):
         job1 = self._get_job_by_name(self.json_deployment_conf, "named-props-instance-pool-name")
         api_client = MagicMock()